@@ -1,158 +1,109 @@
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
-
-# ============= FUZZY SYSTEM SETUP =============
-
-# Define input variables (5 core attributes for employability)
-academic_reputation = ctrl.Antecedent(np.arange(0, 101, 1), 'academic_reputation')
-employer_reputation = ctrl.Antecedent(np.arange(0, 101, 1), 'employer_reputation')
-faculty_student_ratio = ctrl.Antecedent(np.arange(0, 101, 1), 'faculty_student_ratio')
-citations_per_paper = ctrl.Antecedent(np.arange(0, 101, 1), 'citations_per_paper')
-staff_phd = ctrl.Antecedent(np.arange(0, 101, 1), 'staff_phd')
-
-# Define output variable
-employability = ctrl.Consequent(np.arange(0, 101, 1), 'employability')
-
-# Define membership functions for inputs
-for variable in [academic_reputation, employer_reputation, faculty_student_ratio,
-                 citations_per_paper, staff_phd]:
-    variable['low'] = fuzz.trimf(variable.universe, [0, 0, 50])
-    variable['medium'] = fuzz.trimf(variable.universe, [0, 50, 100])
-    variable['high'] = fuzz.trimf(variable.universe, [50, 100, 100])
-
-# Define membership functions for output
-employability['poor'] = fuzz.trimf(employability.universe, [0, 0, 40])
-employability['average'] = fuzz.trimf(employability.universe, [20, 50, 80])
-employability['good'] = fuzz.trimf(employability.universe, [60, 80, 100])
-employability['excellent'] = fuzz.trimf(employability.universe, [80, 100, 100])
-
-# Define fuzzy rules
-rule1 = ctrl.Rule(academic_reputation['high'] & employer_reputation['high'],
-                  employability['excellent'])
-rule2 = ctrl.Rule(employer_reputation['high'] & staff_phd['high'],
-                  employability['good'])
-rule3 = ctrl.Rule(citations_per_paper['high'] & academic_reputation['high'],
-                  employability['good'])
-rule4 = ctrl.Rule(faculty_student_ratio['high'] & staff_phd['high'],
-                  employability['good'])
-rule5 = ctrl.Rule(academic_reputation['low'] & employer_reputation['low'],
-                  employability['poor'])
-rule6 = ctrl.Rule(employer_reputation['medium'] & citations_per_paper['medium'],
-                  employability['average'])
-rule7 = ctrl.Rule(academic_reputation['high'] & citations_per_paper['high'] &
-                  staff_phd['high'], employability['excellent'])
-rule8 = ctrl.Rule(faculty_student_ratio['low'] | staff_phd['low'],
-                  employability['average'])
-
-# Create control system
-employability_ctrl = ctrl.ControlSystem([rule1, rule2, rule3, rule4, rule5,
-                                         rule6, rule7, rule8])
-employability_simulation = ctrl.ControlSystemSimulation(employability_ctrl)
-
-# ============= READ QS ASIA RANKINGS FILE =============
-
-def read_qs_asia_rankings(filename):
-    """
-    Read the QS Asia Rankings CSV file and extract only relevant columns
-    """
-    # Read with multi-level headers and latin-1 encoding
-    df = pd.read_csv(filename, encoding='latin-1', header=[0, 1])
-
-    # Flatten column names
-    df.columns = [' '.join(col).strip() for col in df.columns.values]
-
-    # Skip the first row which contains "Sorting", "RANK", etc. (header labels)
-    df = df.iloc[1:].reset_index(drop=True)
-
-    # Define columns to keep
-    columns_to_keep = {
-        'Unnamed: 1_level_0 2025': 'Rank',
-        'Unnamed: 3_level_0 Institution Name': 'Institution',
-        'Unnamed: 4_level_0 Country/ Territory': 'Country',
-        'Unnamed: 11_level_0 Academic Reputation': 'Academic_Reputation',
-        'Unnamed: 13_level_0 Employer Reputation': 'Employer_Reputation',
-        'Unnamed: 15_level_0 Faculty Student': 'Faculty_Student_Ratio',
-        'Unnamed: 19_level_0 Citations per Paper': 'Citations_per_Paper',
-        'Unnamed: 23_level_0 Staff with PhD': 'Staff_with_PhD'
-    }
 
-    # Select only the columns we need
-    df_selected = df[list(columns_to_keep.keys())].copy()
+from fuzzy_model import CATEGORY_LABELS, calculate_employability_scores
 
-    # Rename columns to simpler names
-    df_selected = df_selected.rename(columns=columns_to_keep)
+# pyarrow is optional: its multi-threaded C++ CSV reader is preferred,
+# with pandas' C parser as the fallback
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
-    # Remove rows where Rank contains non-numeric values (like "Rank display")
-    # This filters out any remaining header rows
-    df_selected = df_selected[pd.to_numeric(df_selected['Rank'], errors='coerce').notna()].copy()
-
-    # Convert Rank to integer
-    df_selected['Rank'] = df_selected['Rank'].astype(int)
-
-    # Convert score columns to numeric
-    score_columns = ['Academic_Reputation', 'Employer_Reputation', 'Faculty_Student_Ratio',
-                     'Citations_per_Paper', 'Staff_with_PhD']
-    for col in score_columns:
-        df_selected[col] = pd.to_numeric(df_selected[col], errors='coerce')
-
-    # Reset index after filtering
-    df_selected = df_selected.reset_index(drop=True)
+# ============= READ QS ASIA RANKINGS FILE =============
 
-    return df_selected
+# Positions of the relevant columns in the raw QS file (inspected once
+# from its header) and the simpler names they are given
+USECOLS = [1, 3, 4, 11, 13, 15, 19, 23]
+COLUMN_NAMES = ['Rank', 'Institution', 'Country', 'Academic_Reputation',
+                'Employer_Reputation', 'Faculty_Student_Ratio',
+                'Citations_per_Paper', 'Staff_with_PhD']
 
-# ============= CALCULATE EMPLOYABILITY =============
+def _read_rankings_pyarrow(filename):
+    """
+    Load the raw rankings through pyarrow's multi-threaded CSV reader,
+    materializing only the relevant columns
+    """
+    # pyarrow needs a name per physical column; only the 8 in
+    # COLUMN_NAMES are materialized via include_columns
+    raw_names = [f'_col{i}' for i in range(37)]
+    for pos, name in zip(USECOLS, COLUMN_NAMES):
+        raw_names[pos] = name
+
+    # Rank stays a string: it mixes plain integers with ranges ("171-180")
+    column_types = {name: pa.float64() for name in COLUMN_NAMES[3:]}
+    column_types.update({name: pa.string() for name in COLUMN_NAMES[:3]})
+
+    table = pacsv.read_csv(
+        filename,
+        read_options=pacsv.ReadOptions(skip_rows=4, column_names=raw_names,
+                                       encoding='latin-1'),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=COLUMN_NAMES,
+            column_types=column_types,
+            null_values=['', '-'],
+            strings_can_be_null=True))
+
+    return table.to_pandas()
 
-def calculate_employability_scores(df):
+def read_qs_asia_rankings(filename):
+    """
+    Read the QS Asia Rankings CSV file, parsing only the relevant columns
     """
-    Calculate employability scores for all universities
+    if PYARROW_AVAILABLE:
+        df = _read_rankings_pyarrow(filename)
+    else:
+        # Parse just the 8 needed columns with latin-1 encoding; all four
+        # preamble rows (two headers, two label rows) are skipped at read
+        # time, so score columns can be typed by the tokenizer directly.
+        # (pd.read_csv(engine='pyarrow') would give Arrow's threaded
+        # tokenizer with fewer changes, but this branch only runs when
+        # pyarrow is not installed - with pyarrow present the native
+        # reader above is used instead)
+        df = pd.read_csv(filename, encoding='latin-1', header=None, skiprows=4,
+                         usecols=USECOLS, names=COLUMN_NAMES, na_values=['-'],
+                         dtype={name: 'float64' for name in COLUMN_NAMES[3:]})
+
+    # Keep only rows with a plain numeric rank; this drops the ranking
+    # ranges ("171-180") used beyond the individually ranked entries.
+    # No defensive .copy(): under copy-on-write the filtered frame can be
+    # modified without touching (or warning about) the original
+    df = df[pd.to_numeric(df['Rank'], errors='coerce').notna()]
+    df['Rank'] = df['Rank'].astype(int)
+
+    return df.reset_index(drop=True)
+
+# ============= DISPLAY =============
+
+def format_table(df):
     """
-    employability_scores = []
-    employability_categories = []
-
-    print(f"Processing {len(df)} universities...")
-
-    for idx, row in df.iterrows():
-        try:
-            # Extract input values (use 50 as default for missing values)
-            inputs = {
-                'academic_reputation': float(row['Academic_Reputation']) if pd.notna(row['Academic_Reputation']) else 50,
-                'employer_reputation': float(row['Employer_Reputation']) if pd.notna(row['Employer_Reputation']) else 50,
-                'faculty_student_ratio': float(row['Faculty_Student_Ratio']) if pd.notna(row['Faculty_Student_Ratio']) else 50,
-                'citations_per_paper': float(row['Citations_per_Paper']) if pd.notna(row['Citations_per_Paper']) else 50,
-                'staff_phd': float(row['Staff_with_PhD']) if pd.notna(row['Staff_with_PhD']) else 50
-            }
-
-            # Set inputs to fuzzy system
-            for key, value in inputs.items():
-                employability_simulation.input[key] = value
-
-            # Compute employability
-            employability_simulation.compute()
-            score = employability_simulation.output['employability']
-
-            # Categorize
-            if score >= 80:
-                category = 'Excellent'
-            elif score >= 60:
-                category = 'Good'
-            elif score >= 40:
-                category = 'Average'
-            else:
-                category = 'Poor'
-
-            employability_scores.append(round(score, 2))
-            employability_categories.append(category)
-
-        except Exception as e:
-            employability_scores.append(None)
-            employability_categories.append('Error')
-
-    df['Employability_Score'] = employability_scores
-    df['Employability_Category'] = employability_categories
-
-    return df
+    Render a DataFrame like to_string(index=False), but converting whole
+    columns with numpy string ops instead of per-cell Python formatting
+    """
+    headers = [str(name) for name in df.columns]
+    rendered = []
+    for name, header in zip(df.columns, headers):
+        values = df[name].to_numpy()
+        numeric = values.dtype.kind in 'fiu'
+        if values.dtype.kind == 'f':
+            decimals = 1 if np.allclose(values, np.round(values, 1)) else 2
+            cells = np.char.mod(f'%.{decimals}f', values)
+        elif numeric:
+            cells = np.char.mod('%d', values)
+        else:
+            cells = np.asarray(values, dtype=str)
+        # numeric columns get one extra slot, matching to_string's sign pad
+        width = max(len(header), int(np.char.str_len(cells).max())) + numeric
+        rendered.append((header.rjust(width), np.char.rjust(cells, width)))
+
+    rows = rendered[0][1]
+    for _, cells in rendered[1:]:
+        rows = np.char.add(np.char.add(rows, ' '), cells)
+    return '\n'.join([' '.join(h for h, _ in rendered)] + rows.tolist())
 
 # ============= MAIN EXECUTION =============
 
@@ -161,10 +112,18 @@ print("FUZZY INFERENCE SYSTEM FOR SDG 4: GRADUATE EMPLOYABILITY ASSESSMENT")
 print("QS Asia University Rankings 2025")
 print("="*100 + "\n")
 
-# Read the file
+# Read the file, preferring the Parquet cache written on the first run
+# (delete dataset.parquet to force a fresh CSV parse)
 filename = 'dataset.csv'
-print(f"Reading file: {filename}")
-df = read_qs_asia_rankings(filename)
+cache = Path('dataset.parquet')
+if cache.exists():
+    print(f"Reading cached file: {cache}")
+    df = pd.read_parquet(cache)
+else:
+    print(f"Reading file: {filename}")
+    df = read_qs_asia_rankings(filename)
+    if PYARROW_AVAILABLE:
+        df.to_parquet(cache, compression='zstd')
 print(f"✓ Successfully loaded {len(df)} universities")
 print(f"✓ Removed header rows (Sorting, Rank display, etc.)")
 print(f"✓ Extracted 5 key attributes for employability assessment\n")
@@ -186,27 +145,39 @@ print("\n" + "="*100)
 print("TOP 20 UNIVERSITIES BY EMPLOYABILITY SCORE")
 print("="*100 + "\n")
 
-valid_results = df[df['Employability_Category'] != 'Error']
-top_20 = valid_results.nlargest(20, 'Employability_Score')
-print(top_20.to_string(index=False))
+valid_results = df[df['Employability_Score'].notna()]
+
+# O(N) partial selection of the top 20, sorting only those 20 rows
+scores = valid_results['Employability_Score'].to_numpy()
+k = min(20, len(scores))
+top_idx = np.argpartition(scores, -k)[-k:]
+top_idx = top_idx[np.argsort(top_idx, kind='stable')]      # ties keep file order
+top_idx = top_idx[np.argsort(-scores[top_idx], kind='stable')]
+top_20 = valid_results.iloc[top_idx]
+print(format_table(top_20))
 
 # Summary Statistics
 print("\n" + "="*100)
 print("SUMMARY STATISTICS")
 print("="*100 + "\n")
 
-category_counts = valid_results['Employability_Category'].value_counts()
+# Count categories directly on the int8 codes; print in descending
+# count order like value_counts did
+codes = valid_results['Employability_Category'].cat.codes.to_numpy()
+counts = np.bincount(codes[codes >= 0], minlength=len(CATEGORY_LABELS))
 print("Employability Category Distribution:")
-for category, count in category_counts.items():
-    percentage = (count / len(valid_results)) * 100
-    print(f"  {category:12s}: {count:4d} ({percentage:5.1f}%)")
+for idx in np.argsort(-counts, kind='stable'):
+    percentage = (counts[idx] / len(valid_results)) * 100
+    print(f"  {CATEGORY_LABELS[idx]:12s}: {counts[idx]:4d} ({percentage:5.1f}%)")
 
+# Score statistics on the NumPy vector extracted above (std matches
+# pandas' sample std, ddof=1)
 print(f"\nEmployability Score Statistics:")
-print(f"  Mean:   {valid_results['Employability_Score'].mean():.2f}")
-print(f"  Median: {valid_results['Employability_Score'].median():.2f}")
-print(f"  Std:    {valid_results['Employability_Score'].std():.2f}")
-print(f"  Min:    {valid_results['Employability_Score'].min():.2f}")
-print(f"  Max:    {valid_results['Employability_Score'].max():.2f}")
+print(f"  Mean:   {scores.mean():.2f}")
+print(f"  Median: {np.median(scores):.2f}")
+print(f"  Std:    {scores.std(ddof=1):.2f}")
+print(f"  Min:    {scores.min():.2f}")
+print(f"  Max:    {scores.max():.2f}")
 
 # Save results with only relevant columns
 output_filename = 'QS_Asia_2025_Employability_Results.csv'
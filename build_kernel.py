@@ -0,0 +1,78 @@
+"""
+Ahead-of-time build of the fuzzy scoring kernel.
+
+Running this script compiles the Mamdani kernel into a `fuzzy_kernel`
+extension module (.so) with numba.pycc, so short-lived runs skip the
+~0.5s JIT warmup entirely; fuzzy_model imports it when present and falls
+back to the JIT kernel otherwise. Rebuild after changing the membership
+functions or rules:
+
+    python build_kernel.py
+"""
+
+from numba.pycc import CC
+import numpy as np
+
+# The discretized output MFs are baked into the compiled module as
+# constants, so they stay in sync with the model definitions
+from fuzzy_model import UNIVERSE, POOR_MF, AVERAGE_MF, GOOD_MF, EXCELLENT_MF
+
+cc = CC('fuzzy_kernel')
+
+@cc.export('score_batch', 'f4[:](f4[:], f4[:], f4[:], f4[:], f4[:])')
+def score_batch(ar, er, fsr, cpp, phd):
+    """
+    Mirrors fuzzy_model._fuzzy_kernel, but with a plain serial loop:
+    AOT exports cannot use prange, and at a few hundred rows the saved
+    warmup outweighs the lost parallelism
+    """
+    c0 = np.float32(0.0)
+    c1 = np.float32(1.0)
+    c50 = np.float32(50.0)
+    c100 = np.float32(100.0)
+    eps = np.float32(1e-9)
+    out_scores = np.empty(ar.shape[0], dtype=np.float32)
+    for i in range(ar.shape[0]):
+        ar_low = max(c0, c1 - ar[i] / c50)
+        ar_med = max(c0, min(ar[i] / c50, (c100 - ar[i]) / c50))
+        ar_high = max(c0, min(c1, (ar[i] - c50) / c50))
+        er_low = max(c0, c1 - er[i] / c50)
+        er_med = max(c0, min(er[i] / c50, (c100 - er[i]) / c50))
+        er_high = max(c0, min(c1, (er[i] - c50) / c50))
+        fsr_low = max(c0, c1 - fsr[i] / c50)
+        fsr_high = max(c0, min(c1, (fsr[i] - c50) / c50))
+        cpp_med = max(c0, min(cpp[i] / c50, (c100 - cpp[i]) / c50))
+        cpp_high = max(c0, min(c1, (cpp[i] - c50) / c50))
+        phd_low = max(c0, c1 - phd[i] / c50)
+        phd_high = max(c0, min(c1, (phd[i] - c50) / c50))
+
+        # Rule strengths, mirroring rule1-rule8
+        r1 = min(ar_high, er_high)                 # excellent
+        r2 = min(er_high, phd_high)                # good
+        r3 = min(cpp_high, ar_high)                # good
+        r4 = min(fsr_high, phd_high)               # good
+        r5 = min(ar_low, er_low)                   # poor
+        r6 = min(er_med, cpp_med)                  # average
+        r7 = min(ar_high, min(cpp_high, phd_high)) # excellent
+        r8 = max(fsr_low, phd_low)                 # average
+
+        exc_s = max(r1, r7)
+        good_s = max(r2, max(r3, r4))
+        avg_s = max(r6, r8)
+        poor_s = r5
+
+        # Aggregate and defuzzify in one pass over the universe
+        num = c0
+        den = c0
+        for iu in range(101):
+            agg = max(max(min(exc_s, EXCELLENT_MF[iu]),
+                          min(good_s, GOOD_MF[iu])),
+                      max(min(avg_s, AVERAGE_MF[iu]),
+                          min(poor_s, POOR_MF[iu])))
+            num += agg * UNIVERSE[iu]
+            den += agg
+        out_scores[i] = num / max(den, eps)
+    return out_scores
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,360 @@
+"""
+Shared fuzzy employability model.
+
+Holds the membership-function constants, the vectorized scoring engines
+(numba kernel / pure NumPy) and the skfuzzy control system used as the
+per-row reference implementation. The control system is built lazily and
+cached, so importing this module stays cheap.
+"""
+
+import hashlib
+import multiprocessing
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import skfuzzy as fuzz
+from skfuzzy import control as ctrl
+
+# numba is optional: without it the pure-NumPy vectorized engine is used
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# The AOT-compiled kernel (built by `python build_kernel.py`) carries no
+# JIT warmup at all and is preferred when its extension module exists
+try:
+    from fuzzy_kernel import score_batch as _score_batch_aot
+except ImportError:
+    _score_batch_aot = None
+
+INPUT_COLUMNS = ['Academic_Reputation', 'Employer_Reputation', 'Faculty_Student_Ratio',
+                 'Citations_per_Paper', 'Staff_with_PhD']
+
+# Antecedent names in the same order as INPUT_COLUMNS
+ANTECEDENT_NAMES = ['academic_reputation', 'employer_reputation',
+                    'faculty_student_ratio', 'citations_per_paper', 'staff_phd']
+
+# Category thresholds and labels; scores are classified into int8 codes
+# with np.digitize and exposed as a pandas Categorical column
+CATEGORY_BINS = np.array([40.0, 60.0, 80.0])
+CATEGORY_LABELS = ['Poor', 'Average', 'Good', 'Excellent']
+
+# Output membership functions, discretized once on the 0-100 universe and
+# shared by the vectorized engines (numba reads them as constant globals).
+# float32 is plenty for 0-100 scores and halves memory bandwidth
+UNIVERSE = np.arange(101, dtype=np.float32)
+POOR_MF = fuzz.trimf(UNIVERSE, [0, 0, 40]).astype(np.float32)
+AVERAGE_MF = fuzz.trimf(UNIVERSE, [20, 50, 80]).astype(np.float32)
+GOOD_MF = fuzz.trimf(UNIVERSE, [60, 80, 100]).astype(np.float32)
+EXCELLENT_MF = fuzz.trimf(UNIVERSE, [80, 100, 100]).astype(np.float32)
+
+# ============= SKFUZZY CONTROL SYSTEM (REFERENCE) =============
+
+@lru_cache(maxsize=None)
+def build_control_system():
+    """
+    Build the skfuzzy control system on first use and cache it, so the
+    rule-graph construction cost is paid at most once per process
+
+    Returns the antecedents (in INPUT_COLUMNS order) and a simulation
+    """
+    # Define input variables (5 core attributes for employability)
+    antecedents = [ctrl.Antecedent(np.arange(0, 101, 1), name)
+                   for name in ANTECEDENT_NAMES]
+    (academic_reputation, employer_reputation, faculty_student_ratio,
+     citations_per_paper, staff_phd) = antecedents
+
+    # Define output variable
+    employability = ctrl.Consequent(np.arange(0, 101, 1), 'employability')
+
+    # Define membership functions for inputs
+    for variable in antecedents:
+        variable['low'] = fuzz.trimf(variable.universe, [0, 0, 50])
+        variable['medium'] = fuzz.trimf(variable.universe, [0, 50, 100])
+        variable['high'] = fuzz.trimf(variable.universe, [50, 100, 100])
+
+    # Define membership functions for output
+    employability['poor'] = fuzz.trimf(employability.universe, [0, 0, 40])
+    employability['average'] = fuzz.trimf(employability.universe, [20, 50, 80])
+    employability['good'] = fuzz.trimf(employability.universe, [60, 80, 100])
+    employability['excellent'] = fuzz.trimf(employability.universe, [80, 100, 100])
+
+    # Define fuzzy rules
+    rule1 = ctrl.Rule(academic_reputation['high'] & employer_reputation['high'],
+                      employability['excellent'])
+    rule2 = ctrl.Rule(employer_reputation['high'] & staff_phd['high'],
+                      employability['good'])
+    rule3 = ctrl.Rule(citations_per_paper['high'] & academic_reputation['high'],
+                      employability['good'])
+    rule4 = ctrl.Rule(faculty_student_ratio['high'] & staff_phd['high'],
+                      employability['good'])
+    rule5 = ctrl.Rule(academic_reputation['low'] & employer_reputation['low'],
+                      employability['poor'])
+    rule6 = ctrl.Rule(employer_reputation['medium'] & citations_per_paper['medium'],
+                      employability['average'])
+    rule7 = ctrl.Rule(academic_reputation['high'] & citations_per_paper['high'] &
+                      staff_phd['high'], employability['excellent'])
+    rule8 = ctrl.Rule(faculty_student_ratio['low'] | staff_phd['low'],
+                      employability['average'])
+
+    # Create control system
+    employability_ctrl = ctrl.ControlSystem([rule1, rule2, rule3, rule4, rule5,
+                                             rule6, rule7, rule8])
+    simulation = ctrl.ControlSystemSimulation(employability_ctrl)
+
+    return antecedents, simulation
+
+# ============= VECTORIZED ENGINES =============
+
+def _extract_inputs(df):
+    """
+    Pull the five input columns into one contiguous float array and
+    return them column-wise, sanitized so the engines cannot fail:
+    missing values default to 50 and everything is clipped into the
+    0-100 universe
+    """
+    arr = df[INPUT_COLUMNS].to_numpy(dtype=np.float32, copy=False)
+    arr = np.nan_to_num(arr, nan=50.0)
+    arr = np.clip(arr, 0.0, 100.0)
+    return arr[:, 0], arr[:, 1], arr[:, 2], arr[:, 3], arr[:, 4]
+
+def _input_memberships(x):
+    """
+    Closed-form triangular low/medium/high memberships on the 0-100 universe
+    (same shapes as the trimf definitions above, evaluated directly)
+    """
+    low = np.clip(1 - x / 50, 0, 1)
+    medium = np.clip(np.where(x <= 50, x / 50, (100 - x) / 50), 0, 1)
+    high = np.clip((x - 50) / 50, 0, 1)
+    return low, medium, high
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fuzzy_kernel(ar, er, fsr, cpp, phd, out_scores):
+        """
+        JIT-compiled Mamdani kernel: one independent inference per row,
+        parallelized with prange across universities
+        """
+        c0 = np.float32(0.0)
+        c1 = np.float32(1.0)
+        c50 = np.float32(50.0)
+        c100 = np.float32(100.0)
+        eps = np.float32(1e-9)
+        for i in prange(ar.shape[0]):
+            ar_low = max(c0, c1 - ar[i] / c50)
+            ar_med = max(c0, min(ar[i] / c50, (c100 - ar[i]) / c50))
+            ar_high = max(c0, min(c1, (ar[i] - c50) / c50))
+            er_low = max(c0, c1 - er[i] / c50)
+            er_med = max(c0, min(er[i] / c50, (c100 - er[i]) / c50))
+            er_high = max(c0, min(c1, (er[i] - c50) / c50))
+            fsr_low = max(c0, c1 - fsr[i] / c50)
+            fsr_high = max(c0, min(c1, (fsr[i] - c50) / c50))
+            cpp_med = max(c0, min(cpp[i] / c50, (c100 - cpp[i]) / c50))
+            cpp_high = max(c0, min(c1, (cpp[i] - c50) / c50))
+            phd_low = max(c0, c1 - phd[i] / c50)
+            phd_high = max(c0, min(c1, (phd[i] - c50) / c50))
+
+            # Rule strengths, mirroring rule1-rule8
+            r1 = min(ar_high, er_high)                 # excellent
+            r2 = min(er_high, phd_high)                # good
+            r3 = min(cpp_high, ar_high)                # good
+            r4 = min(fsr_high, phd_high)               # good
+            r5 = min(ar_low, er_low)                   # poor
+            r6 = min(er_med, cpp_med)                  # average
+            r7 = min(ar_high, min(cpp_high, phd_high)) # excellent
+            r8 = max(fsr_low, phd_low)                 # average
+
+            exc_s = max(r1, r7)
+            good_s = max(r2, max(r3, r4))
+            avg_s = max(r6, r8)
+            poor_s = r5
+
+            # Aggregate and defuzzify in one pass over the universe, so
+            # no per-row temporary arrays are ever allocated
+            num = c0
+            den = c0
+            for iu in range(101):
+                agg = max(max(min(exc_s, EXCELLENT_MF[iu]),
+                              min(good_s, GOOD_MF[iu])),
+                          max(min(avg_s, AVERAGE_MF[iu]),
+                              min(poor_s, POOR_MF[iu])))
+                num += agg * UNIVERSE[iu]
+                den += agg
+            out_scores[i] = num / max(den, eps)
+
+# Rule matrix for the AND rules (rule1-rule7): one row per rule, entries
+# are the required term index per input in INPUT_COLUMNS order
+# (0=low, 1=medium, 2=high) or -1 for "don't care"; RULE_OUT indexes the
+# output term in OUT_MFS. The OR rule (rule8) is applied separately.
+RULE_TERMS = np.array([
+    [2,  2, -1, -1, -1],   # rule1: ar high & er high           -> excellent
+    [-1, 2, -1, -1,  2],   # rule2: er high & phd high          -> good
+    [2, -1, -1,  2, -1],   # rule3: cpp high & ar high          -> good
+    [-1, -1, 2, -1,  2],   # rule4: fsr high & phd high         -> good
+    [0,  0, -1, -1, -1],   # rule5: ar low & er low             -> poor
+    [-1, 1, -1,  1, -1],   # rule6: er medium & cpp medium      -> average
+    [2, -1, -1,  2,  2],   # rule7: ar & cpp & phd high         -> excellent
+], dtype=np.int8)
+RULE_OUT = np.array([3, 2, 2, 2, 0, 1, 3], dtype=np.int8)
+OUT_MFS = np.stack([POOR_MF, AVERAGE_MF, GOOD_MF, EXCELLENT_MF])
+
+def _rule_strengths(ar, er, fsr, cpp, phd):
+    """
+    Strengths of the AND rules (N, 7) and the OR rule8 (N,), computed
+    from an (N, 5 inputs, 3 terms) membership tensor with a single
+    gather over the rule matrix
+    """
+    M = np.stack([np.stack(_input_memberships(x), axis=1)
+                  for x in (ar, er, fsr, cpp, phd)], axis=1)
+
+    # Gather each AND rule's required memberships ("don't care" -> 1) and
+    # take the minimum across inputs
+    gathered = M[:, np.arange(5)[None, :], RULE_TERMS.clip(min=0)]
+    strength = np.where(RULE_TERMS >= 0, gathered, 1.0).min(axis=2)
+
+    # rule8: fsr low | phd low -> average (OR takes the maximum)
+    r8 = np.maximum(M[:, 2, 0], M[:, 4, 0])
+
+    return strength, r8
+
+def _scores_numpy(ar, er, fsr, cpp, phd):
+    """
+    Pure-NumPy fallback engine: rule strengths from the rule matrix and
+    an (N, 101) aggregated output surface
+    """
+    strength, r8 = _rule_strengths(ar, er, fsr, cpp, phd)
+
+    # Clip each rule's output MF at its strength and aggregate by maximum
+    # -> one (N, 101) output surface
+    clipped = np.minimum(strength[:, :, None], OUT_MFS[RULE_OUT][None, :, :])
+    agg = np.maximum(clipped.max(axis=1),
+                     np.minimum(r8[:, None], AVERAGE_MF[None, :]))
+
+    # Centroid defuzzification on the discrete grid
+    return (agg * UNIVERSE).sum(axis=1) / np.maximum(agg.sum(axis=1), 1e-9)
+
+# On-disk memoization of computed scores, keyed by a hash of the input
+# columns so any change to the data forces a recompute
+CACHE_DIR = Path('.cache')
+
+def _score_cache_path(df):
+    key = pd.util.hash_pandas_object(df[INPUT_COLUMNS], index=False)
+    digest = hashlib.blake2b(key.to_numpy().tobytes(), digest_size=8).hexdigest()
+    return CACHE_DIR / f'scores-{digest}.npy'
+
+def calculate_employability_scores(df):
+    """
+    Calculate employability scores for all universities
+
+    Uses the AOT-compiled kernel when built, else the JIT kernel when
+    numba is available (parallel across rows), else the vectorized NumPy
+    engine; both defuzzify by centroid on
+    the 0-100 grid. Scores are memoized under .cache/ keyed on the input
+    hash, so reruns over unchanged data skip the fuzzy compute entirely
+    """
+    print(f"Processing {len(df)} universities...")
+
+    cache_path = _score_cache_path(df)
+    if cache_path.exists():
+        scores = np.load(cache_path)
+    else:
+        ar, er, fsr, cpp, phd = _extract_inputs(df)
+
+        if _score_batch_aot is not None:
+            scores = _score_batch_aot(ar, er, fsr, cpp, phd)
+        elif NUMBA_AVAILABLE:
+            scores = np.empty(ar.shape[0], dtype=np.float32)
+            _fuzzy_kernel(ar, er, fsr, cpp, phd, scores)
+        else:
+            scores = _scores_numpy(ar, er, fsr, cpp, phd)
+
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            np.save(cache_path, scores)
+        except OSError:
+            pass  # caching is best-effort
+
+    # Store scores as float64 so the 2-decimal rounding displays exactly
+    df['Employability_Score'] = np.round(scores.astype(np.float64), 2)
+    codes = np.digitize(scores, CATEGORY_BINS).astype(np.int8)
+    df['Employability_Category'] = pd.Categorical.from_codes(
+        codes, categories=CATEGORY_LABELS)
+
+    return df
+
+def _score_chunk(chunk):
+    """
+    Score one (5, m) stack of input columns with the skfuzzy control
+    system; also runs inside worker processes, where the lru_cache gives
+    each process its own control system
+    """
+    ar, er, fsr, cpp, phd = chunk
+    antecedents, simulation = build_control_system()
+
+    # Writing simulation.input[label] scans the whole rule graph for the
+    # matching antecedent on every assignment; the antecedent objects are
+    # already known, so write their inputs directly (values are within
+    # the 0-100 universe, making the bounds check redundant)
+    input_acceptor = simulation.input
+
+    # Certain in-domain inputs fire no rule at all (e.g. er=50, fsr>=50,
+    # phd=50 zero every strength regardless of ar/cpp), which compute()
+    # cannot defuzzify; the vectorized engines cover this with their eps
+    # guard. Mark those rows NaN up front and run the control system only
+    # on the rest - skipping them (rather than catching the failure) also
+    # keeps the simulation's result cache from replaying a stale output
+    # when a degenerate input repeats
+    strength, r8 = _rule_strengths(ar, er, fsr, cpp, phd)
+    fired = (strength.max(axis=1) > 0) | (r8 > 0)
+
+    scores = np.full(ar.shape[0], np.nan)
+    for i in np.flatnonzero(fired):
+        for antecedent, value in zip(antecedents,
+                                     (ar[i], er[i], fsr[i], cpp[i], phd[i])):
+            antecedent.input['current'] = float(value)
+        simulation._update_unique_id()
+        input_acceptor._update_to_current()
+
+        # Compute employability
+        simulation.compute()
+        scores[i] = round(simulation.output['employability'], 2)
+
+    return scores
+
+def calculate_employability_scores_skfuzzy(df, n_jobs=None):
+    """
+    Per-row reference implementation using the skfuzzy control system
+    (kept for cross-checking the vectorized engine)
+
+    The rows are independent, so larger frames are split across a process
+    pool; pass n_jobs=1 to force serial execution
+    """
+    print(f"Processing {len(df)} universities...")
+
+    stacked = np.stack(_extract_inputs(df))
+
+    # Keep a sensible amount of work per process; small frames run serial
+    if n_jobs is None:
+        n_jobs = min(os.cpu_count() or 1, max(1, len(df) // 32))
+
+    if n_jobs > 1:
+        chunks = np.array_split(stacked, n_jobs, axis=1)
+        with multiprocessing.Pool(n_jobs) as pool:
+            scores = np.concatenate(pool.map(_score_chunk, chunks))
+    else:
+        scores = _score_chunk(stacked)
+
+    # NaN marks rows where no rule fired; code -1 renders as NaN category
+    codes = np.where(np.isnan(scores), -1,
+                     np.digitize(scores, CATEGORY_BINS)).astype(np.int8)
+
+    df['Employability_Score'] = scores
+    df['Employability_Category'] = pd.Categorical.from_codes(
+        codes, categories=CATEGORY_LABELS)
+
+    return df